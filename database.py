@@ -7,33 +7,264 @@ Stores extracted process flow data in a database table.
 import sqlite3
 import json
 import logging
-from typing import List, Dict, Any, Optional
+import queue
+import threading
+from contextlib import contextmanager
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 from pathlib import Path
 from datetime import datetime
+from operator import itemgetter
+
+try:
+    import orjson
+    orjson_available = True
+except ImportError:
+    orjson_available = False
+
+try:
+    import zstandard
+    zstandard_available = True
+except ImportError:
+    zstandard_available = False
 
 logger = logging.getLogger(__name__)
 
+if orjson_available:
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+else:
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode('utf-8')
+    _loads = json.loads
+
+# Leading bytes of every zstd frame, used to tell compressed raw_data from plain JSON
+ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+
 
 class Database:
     """
     Manages database storage for process flow data.
     """
     
-    def __init__(self, db_path: str = "stream.db"):
+    # Secondary indexes, keyed by name. idx_process_created covers
+    # list_all_processes so it can be served without a table scan or sort;
+    # idx_step_process serves the step lookups in get_process_flow.
+    INDEXES = {
+        'idx_process_created': """
+            CREATE INDEX IF NOT EXISTS idx_process_created ON process (
+                created_at DESC,
+                process_name,
+                process_description,
+                source_document,
+                extraction_timestamp
+            )
+        """,
+        'idx_step_process': """
+            CREATE INDEX IF NOT EXISTS idx_step_process ON step (process_id, step_number)
+        """,
+    }
+    
+    # Step fields stored as comma-separated text
+    LIST_FIELDS = ('inputs', 'outputs', 'tools', 'decision_points')
+    
+    # Values used for step fields missing from an extracted flow
+    STEP_DEFAULTS = {
+        'step_number': 0,
+        'step_name': '',
+        'description': '',
+        'responsible_role': '',
+        'inputs': [],
+        'outputs': [],
+        'tools': [],
+        'decision_points': [],
+    }
+    
+    _step_scalars = itemgetter('step_number', 'step_name', 'description', 'responsible_role')
+    _step_lists = itemgetter(*LIST_FIELDS)
+    
+    # Batches larger than this are loaded with secondary indexes dropped
+    BULK_INSERT_THRESHOLD = 1000
+    
+    _INSERT_PROCESS_SQL = """
+        INSERT INTO process (
+            process_name, 
+            process_description, 
+            source_document,
+            document_path, 
+            extraction_model,
+            raw_data
+        ) VALUES (?, ?, ?, ?, ?, ?)
+    """
+    
+    _INSERT_STEP_SQL = """
+        INSERT INTO step (
+            process_id, 
+            step_number, 
+            step_name, 
+            step_description,
+            responsible_role, 
+            inputs, 
+            outputs, 
+            tools,
+            decision_points
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+    
+    _INSERT_NEXT_STEP_SQL = """
+        INSERT INTO step_next_step (step_id, ordinal, next_step_number) VALUES (?, ?, ?)
+    """
+    
+    _CREATE_NEXT_STEP_TABLE_SQL = """
+        CREATE TABLE IF NOT EXISTS step_next_step (
+            step_id INTEGER NOT NULL,
+            ordinal INTEGER NOT NULL,
+            next_step_number INTEGER NOT NULL,
+            PRIMARY KEY (step_id, ordinal),
+            FOREIGN KEY (step_id) REFERENCES step(step_id) ON DELETE CASCADE
+        ) WITHOUT ROWID
+    """
+    
+    def __init__(self, db_path: str = "stream.db", store_raw: bool = False, pool_size: int = 4):
         """
-        Initialize the database connection.
+        Initialize the database connection pool.
         
         Args:
             db_path: Path to SQLite database file
+            store_raw: Also keep the full, compressed process flow in
+                raw_data (useful for debugging). When False, flows are
+                rebuilt from the process and step tables.
+            pool_size: Number of connections shared between threads. An
+                in-memory database always uses a single connection.
         """
         self.db_path = db_path
-        self.conn = None
-        self._connect()
+        self.store_raw = store_raw
+        self.pool_size = 1 if db_path == ":memory:" else max(1, pool_size)
+        # zstd contexts are not thread-safe, so each thread gets its own
+        self._zstd = threading.local()
+        
+        self._pool = queue.Queue()
+        self._pool_lock = threading.Lock()
+        self._closed = False
+        for _ in range(self.pool_size):
+            self._pool.put(self._connect())
+        self._migrate()
+    
+    def _connect(self) -> Tuple[sqlite3.Connection, sqlite3.Cursor]:
+        """
+        Open a pooled database connection.
+        
+        Returns:
+            The connection and a long-lived cursor for its insert path; the
+            connection's statement cache keeps the parsed INSERTs between calls
+        """
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=30,
+            check_same_thread=False,
+            cached_statements=256
+        )
+        conn.row_factory = sqlite3.Row  # Enable column access by name
+        
+        # WAL lets a batch commit without a full fsync of the main database file,
+        # and lets readers on other connections run alongside a writer
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-65536")
+        return conn, conn.cursor()
+    
+    @contextmanager
+    def _acquire(self) -> Iterator[Tuple[sqlite3.Connection, sqlite3.Cursor]]:
+        """
+        Borrow a connection and its cursor from the pool.
+        
+        Raises:
+            sqlite3.ProgrammingError: If the database has been closed
+        """
+        if self._closed:
+            raise sqlite3.ProgrammingError("Cannot operate on a closed database.")
+        entry = self._pool.get()
+        if entry is None:
+            # Sentinel left by close(); pass it on to any other waiter
+            self._pool.put(None)
+            raise sqlite3.ProgrammingError("Cannot operate on a closed database.")
+        try:
+            yield entry
+        finally:
+            with self._pool_lock:
+                if self._closed:
+                    # Borrowed while close() ran, so close it on return
+                    entry[0].close()
+                else:
+                    self._pool.put(entry)
+    
+    def _migrate(self):
+        """Add columns and tables introduced after the original schema to existing databases."""
+        with self._acquire() as (conn, _):
+            columns = {row['name'] for row in conn.execute("PRAGMA table_info(process)")}
+            if not columns:
+                return
+            if 'raw_data' not in columns:
+                conn.execute("ALTER TABLE process ADD COLUMN raw_data BLOB")
+            
+            next_step_columns = {
+                row['name'] for row in conn.execute("PRAGMA table_info(step_next_step)")
+            }
+            if next_step_columns and 'ordinal' not in next_step_columns:
+                # The original successor order was not stored; keep ascending order
+                conn.execute("ALTER TABLE step_next_step RENAME TO step_next_step_old")
+                conn.execute(self._CREATE_NEXT_STEP_TABLE_SQL)
+                conn.execute("""
+                    INSERT INTO step_next_step (step_id, ordinal, next_step_number)
+                    SELECT step_id,
+                           ROW_NUMBER() OVER (PARTITION BY step_id ORDER BY next_step_number) - 1,
+                           next_step_number
+                    FROM step_next_step_old
+                """)
+                conn.execute("DROP TABLE step_next_step_old")
+            conn.execute(self._CREATE_NEXT_STEP_TABLE_SQL)
+            conn.commit()
+        self.rebuild_indexes()
+    
+    def _pack_raw_data(self, process_flow: Dict[str, Any]) -> bytes:
+        """
+        Serialize a process flow for the raw_data column.
+        
+        The flow is encoded as JSON and zstd-compressed when zstandard is
+        installed; otherwise the plain JSON bytes are stored.
+        
+        Args:
+            process_flow: Dictionary containing process flow data
+            
+        Returns:
+            Serialized process flow
+        """
+        data = _dumps(process_flow)
+        if zstandard_available:
+            if not hasattr(self._zstd, 'compressor'):
+                self._zstd.compressor = zstandard.ZstdCompressor(level=3)
+            return self._zstd.compressor.compress(data)
+        return data
     
-    def _connect(self):
-        """Establish database connection."""
-        self.conn = sqlite3.connect(self.db_path)
-        self.conn.row_factory = sqlite3.Row  # Enable column access by name
+    def _unpack_raw_data(self, raw_data: bytes) -> Dict[str, Any]:
+        """
+        Deserialize a raw_data value written by _pack_raw_data.
+        
+        Args:
+            raw_data: Compressed or plain JSON bytes
+            
+        Returns:
+            Process flow dictionary
+        """
+        if isinstance(raw_data, bytes) and raw_data.startswith(ZSTD_MAGIC):
+            if not zstandard_available:
+                raise ImportError(
+                    "zstandard is required to read compressed raw_data. Install with: pip install zstandard"
+                )
+            if not hasattr(self._zstd, 'decompressor'):
+                self._zstd.decompressor = zstandard.ZstdDecompressor()
+            raw_data = self._zstd.decompressor.decompress(raw_data)
+        return _loads(raw_data)
     
     def insert_process_flow(self, process_flow: Dict[str, Any]) -> int:
         """
@@ -45,64 +276,75 @@ class Database:
         Returns:
             ID of the inserted process flow
         """
-        cursor = self.conn.cursor()
+        with self._acquire() as (conn, cursor):
+            with conn:
+                cursor.execute("BEGIN IMMEDIATE")
+                process_id = self._insert_process_flow(cursor, process_flow)
+        logger.info(f"Inserted process flow: {process_flow.get('process_name')} (ID: {process_id})")
+        return process_id
+    
+    def _insert_process_flow(self, cursor: sqlite3.Cursor, process_flow: Dict[str, Any]) -> int:
+        """
+        Insert a process flow and its steps without committing.
         
+        Args:
+            cursor: Cursor to execute the inserts on
+            process_flow: Dictionary containing process flow data
+            
+        Returns:
+            ID of the inserted process flow
+        """
         # Insert main process flow record
-        cursor.execute("""
-            INSERT INTO process (
-                process_name, 
-                process_description, 
-                source_document,
-                document_path, 
-                extraction_model
-            ) VALUES (?, ?, ?, ?, ?)
-        """, (
+        cursor.execute(self._INSERT_PROCESS_SQL, (
             process_flow.get('process_name', ''),
             process_flow.get('process_description', ''),
             process_flow.get('source_document', ''),
             process_flow.get('document_path', ''),
             process_flow.get('extraction_model', ''),
+            self._pack_raw_data(process_flow) if self.store_raw else None,
         ))
         
         process_id = cursor.lastrowid
         
-        # Insert steps
+        # Insert steps in a single batch
         steps = process_flow.get('steps', [])
+        step_rows = []
         for step in steps:
-            cursor.execute("""
-                INSERT INTO step (
-                    process_id, 
-                    step_number, 
-                    step_name, 
-                    step_description,
-                    responsible_role, 
-                    inputs, 
-                    outputs, 
-                    tools,
-                    decision_points, 
-                    next_steps
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                process_id,
-                step.get('step_number', 0),
-                step.get('step_name', ''),
-                step.get('description', ''),
-                step.get('responsible_role', ''),
-                ", ".join(step.get('inputs', [])),
-                ", ".join(step.get('outputs', [])),
-                ", ".join(step.get('tools', [])),
-                ", ".join(step.get('decision_points', [])),
-                ", ".join(map(str, step.get('next_steps', [])))
-            ))
-        
-        self.conn.commit()
-        logger.info(f"Inserted process flow: {process_flow.get('process_name')} (ID: {process_id})")
+            step = {**self.STEP_DEFAULTS, **step}
+            step_rows.append(
+                (process_id,)
+                + self._step_scalars(step)
+                + tuple(map(", ".join, self._step_lists(step)))
+            )
+        cursor.executemany(self._INSERT_STEP_SQL, step_rows)
+        
+        # Step IDs from one executemany are consecutive within the transaction,
+        # so they can be recovered from the last one
+        if steps:
+            last_step_id = cursor.execute("SELECT last_insert_rowid()").fetchone()[0]
+            first_step_id = last_step_id - len(steps) + 1
+            # Unconstrained providers can emit null successors; skip them
+            next_step_rows = [
+                (step_id, ordinal, next_step)
+                for step_id, step in enumerate(steps, first_step_id)
+                for ordinal, next_step in enumerate(
+                    n for n in step.get('next_steps') or [] if n is not None
+                )
+            ]
+            cursor.executemany(self._INSERT_NEXT_STEP_SQL, next_step_rows)
+        
         return process_id
     
     def insert_multiple(self, process_flows: List[Dict[str, Any]]) -> List[int]:
         """
         Insert multiple process flows into the database.
         
+        All flows are written in a single transaction on one pooled
+        connection and committed once. A flow that fails to insert is
+        rolled back to its savepoint and skipped, leaving the rest of the
+        batch intact. Batches larger than BULK_INSERT_THRESHOLD are loaded
+        with secondary indexes dropped and rebuilt afterwards.
+        
         Args:
             process_flows: List of process flow dictionaries
             
@@ -110,15 +352,56 @@ class Database:
             List of inserted process flow IDs
         """
         ids = []
-        for flow in process_flows:
-            try:
-                flow_id = self.insert_process_flow(flow)
-                ids.append(flow_id)
-            except Exception as e:
-                logger.error(f"Failed to insert process flow: {e}")
-                continue
+        bulk = len(process_flows) > self.BULK_INSERT_THRESHOLD
+        
+        if bulk:
+            self.drop_indexes()
+        try:
+            self._insert_batch(process_flows, ids)
+        finally:
+            if bulk:
+                self.rebuild_indexes()
+        
+        logger.info(f"Inserted {len(ids)} process flows")
         return ids
     
+    def _insert_batch(self, process_flows: List[Dict[str, Any]], ids: List[int]):
+        """
+        Insert process flows in one transaction, appending their IDs to ids.
+        
+        Args:
+            process_flows: List of process flow dictionaries
+            ids: List that receives the ID of each inserted flow
+        """
+        with self._acquire() as (conn, cursor), conn:
+            # Take the write lock up front so concurrent batches queue on the
+            # busy timeout instead of failing on a lock upgrade
+            cursor.execute("BEGIN IMMEDIATE")
+            for flow in process_flows:
+                cursor.execute("SAVEPOINT insert_flow")
+                try:
+                    flow_id = self._insert_process_flow(cursor, flow)
+                    ids.append(flow_id)
+                except Exception as e:
+                    cursor.execute("ROLLBACK TO SAVEPOINT insert_flow")
+                    logger.error(f"Failed to insert process flow: {e}")
+                finally:
+                    cursor.execute("RELEASE SAVEPOINT insert_flow")
+    
+    def drop_indexes(self):
+        """Drop the secondary indexes, e.g. before a bulk load."""
+        with self._acquire() as (conn, _):
+            for name in self.INDEXES:
+                conn.execute(f"DROP INDEX IF EXISTS {name}")
+            conn.commit()
+    
+    def rebuild_indexes(self):
+        """Create any missing secondary indexes."""
+        with self._acquire() as (conn, _):
+            for sql in self.INDEXES.values():
+                conn.execute(sql)
+            conn.commit()
+    
     def list_all_processes(self) -> List[Dict[str, Any]]:
         """
         List all process flows in the database.
@@ -126,21 +409,107 @@ class Database:
         Returns:
             List of process flow summaries
         """
-        cursor = self.conn.cursor()
-        cursor.execute("""
-            SELECT process_id, process_name, process_description, source_document,
-                   extraction_timestamp, created_at
-            FROM process
-            ORDER BY created_at DESC
-        """)
+        with self._acquire() as (conn, _):
+            rows = conn.execute("""
+                SELECT process_id, process_name, process_description, source_document,
+                       extraction_timestamp, created_at
+                FROM process
+                ORDER BY created_at DESC
+            """).fetchall()
+        
+        return [dict(row) for row in rows]
+    
+    def get_process_flow(self, process_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Retrieve a process flow.
+        
+        Returns the flow exactly as inserted when raw_data was stored;
+        otherwise it is rebuilt from the process, step and step_next_step
+        tables.
+        
+        Args:
+            process_id: ID of the process flow
+            
+        Returns:
+            Process flow dictionary, or None if no such process exists
+        """
+        with self._acquire() as (conn, _):
+            row = conn.execute(
+                "SELECT * FROM process WHERE process_id = ?", (process_id,)
+            ).fetchone()
+            
+            if row is None:
+                return None
+            if row['raw_data'] is not None:
+                return self._unpack_raw_data(row['raw_data'])
+            
+            next_step_rows = conn.execute("""
+                SELECT n.step_id, n.next_step_number
+                FROM step_next_step n
+                JOIN step s ON s.step_id = n.step_id
+                WHERE s.process_id = ?
+                ORDER BY n.step_id, n.ordinal
+            """, (process_id,)).fetchall()
+            step_rows = conn.execute("""
+                SELECT * FROM step WHERE process_id = ? ORDER BY step_number, step_id
+            """, (process_id,)).fetchall()
+        
+        next_steps = {}
+        for step_id, next_step in next_step_rows:
+            next_steps.setdefault(step_id, []).append(next_step)
         
-        return [dict(row) for row in cursor.fetchall()]
+        steps = []
+        for step_row in step_rows:
+            step = {
+                'step_number': step_row['step_number'],
+                'step_name': step_row['step_name'],
+                'description': step_row['step_description'],
+                'responsible_role': step_row['responsible_role'],
+            }
+            for field in self.LIST_FIELDS:
+                value = step_row[field]
+                step[field] = value.split(", ") if value else []
+            
+            if step_row['step_id'] in next_steps:
+                step['next_steps'] = next_steps[step_row['step_id']]
+            elif 'next_steps' in step_row.keys() and step_row['next_steps']:
+                # Rows written before step_next_step existed
+                step['next_steps'] = [
+                    int(n) if n.isdigit() else n for n in step_row['next_steps'].split(", ")
+                ]
+            else:
+                step['next_steps'] = []
+            steps.append(step)
+        
+        return {
+            'process_name': row['process_name'],
+            'process_description': row['process_description'],
+            'source_document': row['source_document'],
+            'document_path': row['document_path'],
+            'extraction_model': row['extraction_model'],
+            'steps': steps,
+        }
     
     def close(self):
-        """Close database connection."""
-        if self.conn:
-            self.conn.close()
-            logger.info("Database connection closed")
+        """
+        Close all pooled database connections.
+        
+        Connections borrowed by other threads are closed when they are
+        returned to the pool.
+        """
+        with self._pool_lock:
+            if self._closed:
+                return
+            self._closed = True
+            while True:
+                try:
+                    conn, _ = self._pool.get_nowait()
+                except queue.Empty:
+                    break
+                conn.close()
+            # Wake threads waiting for a connection so they can raise
+            self._pool.put(None)
+        logger.info("Database connection closed")
     
     def __enter__(self):
         """Context manager entry."""
@@ -15,6 +15,8 @@ Features:
 - Recursive or non-recursive search through directories
 - Automatic detection of supported file types
 - Extraction of text content with metadata (path, name, extension, relative path)
+- Parallel reading of .txt/.docx files across a thread pool; PDFs are parsed one
+  at a time there, and in parallel only with the opt-in process pool
 - Logging of successes and errors for traceability
 
 Example:
@@ -22,17 +24,68 @@ Example:
     >>> reader = DocumentReader(root_folder="data/documents", recursive=True)
     >>> docs = reader.read_all_documents()
     >>> print(docs[0]['content'])
+    >>> for doc in reader.iter_documents():
+    ...     print(doc['name'])
 """
 
+import mmap
 import os
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 import logging
-import PyPDF2
-from docx import Document
+import xml.etree.ElementTree as ElementTree
+import zipfile
+
+try:
+    import fitz  # PyMuPDF
+    fitz_available = True
+except ImportError:
+    fitz_available = False
+
+try:
+    import PyPDF2
+    pypdf2_available = True
+except ImportError:
+    pypdf2_available = False
 
 logger = logging.getLogger(__name__)
 
+# PyMuPDF does not support multithreaded use, so thread-pool readers parse
+# PDFs one at a time. Each process of a process pool has its own lock.
+_fitz_lock = threading.Lock()
+
+# WordprocessingML tags used when reading .docx files
+_W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+_W_P = _W + 'p'
+_W_R = _W + 'r'
+_W_T = _W + 't'
+_W_TAB = _W + 'tab'
+_W_BREAKS = (_W + 'br', _W + 'cr')
+
+
+def _read_document_worker(root_folder: str, file_path: Path, extension: str) -> Dict[str, Any]:
+    """
+    Read a single document inside a worker process.
+
+    Defined at module scope so it can be pickled by `ProcessPoolExecutor`.
+    """
+    return DocumentReader(root_folder, recursive=False).read_document(file_path, extension)
+
+
+def _extract_pdf_pages(file_path: str, start: int, stop: int) -> List[str]:
+    """
+    Extract text from a range of PDF pages inside a worker process.
+
+    Defined at module scope so it can be pickled by `ProcessPoolExecutor`.
+    Each worker opens its own PyMuPDF document.
+    """
+    with fitz.open(file_path) as doc:
+        return [doc.load_page(i).get_text("text") for i in range(start, stop)]
+
+
 class DocumentReader:
     """
     DocumentReader
@@ -47,13 +100,28 @@ class DocumentReader:
         Root folder path containing documents.
     recursive : bool
         Whether to search subdirectories recursively.
-    supported_extensions : set
-        File extensions supported by the reader.
+    max_workers : Optional[int]
+        Number of workers used by `read_all_documents`.
+    use_processes : bool
+        Whether to read with a process pool instead of a thread pool. Only a
+        process pool parses PDFs in parallel.
+    supported_extensions : frozenset
+        Lowercase file extensions supported by the reader.
+    pdf_parallel_page_threshold : int
+        Page count above which PDF pages are extracted in parallel when
+        `use_processes` is set.
     """
 
-    supported_extensions = {'.pdf', '.docx', '.txt'}
+    supported_extensions = frozenset({'.pdf', '.docx', '.txt'})
+    pdf_parallel_page_threshold = 50
     
-    def __init__(self, root_folder: str, recursive: bool = True):
+    def __init__(
+        self,
+        root_folder: str,
+        recursive: bool = True,
+        max_workers: Optional[int] = None,
+        use_processes: bool = False
+    ):
         """
         Initialize the DocumentReader.
 
@@ -63,6 +131,17 @@ class DocumentReader:
             Root folder path containing documents.
         recursive : bool, optional (default=True)
             If True, search subdirectories recursively.
+        max_workers : Optional[int], optional (default=None)
+            Number of parallel workers; defaults to `os.cpu_count()`.
+            A value of 1 reads documents sequentially.
+        use_processes : bool, optional (default=False)
+            If True, use a process pool instead of a thread pool. This speeds up
+            PDF-heavy collections, where parsing is CPU-bound: the thread pool
+            parses PyMuPDF documents one at a time, and PyPDF2 holds the GIL.
+            When only one document is read at a time, the pages of long PDFs
+            are split across processes instead. Under the spawn start method
+            (Windows, macOS) the calling script must guard its entry point
+            with `if __name__ == "__main__":`.
 
         Raises:
         -------
@@ -75,36 +154,70 @@ class DocumentReader:
             raise ValueError(f"Folder does not exist: {root_folder}")
         
         self.recursive = recursive
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.use_processes = use_processes
+        self._suffixes = tuple(self.supported_extensions)
+        self._readers = {
+            '.pdf': self.read_pdf,
+            '.docx': self.read_docx,
+            '.txt': self.read_txt,
+        }
     
-    def find_documents(self) -> List[Path]:
+    def find_documents(self) -> List[Tuple[Path, str]]:
         """
         Discover all supported documents in the folder structure.
 
         Returns:
         --------
-        List[Path]
-            A sorted list of file paths to supported documents.
+        List[Tuple[Path, str]]
+            A sorted list of `(file_path, extension)` pairs for supported
+            documents. The extension is lowercase with its leading dot, so
+            it can be passed straight to `read_document`.
 
         Notes:
         ------
-        - Uses glob patterns for recursive or non-recursive search.
+        - Walks the tree with `os.scandir`, descending into subdirectories
+          only when `recursive` is set. Directory symlinks are not followed.
         - Logs the number of documents found.
         """
-        documents = []
-        
-        pattern = "**/*" if self.recursive else "*"
-        
-        for file_path in self.root_folder.glob(pattern):
-            if file_path.is_file() and file_path.suffix.lower() in self.supported_extensions:
-                documents.append(file_path)
+        documents = list(self._scan_folder(str(self.root_folder)))
         
         logger.info(f"Found {len(documents)} documents in {self.root_folder}")
         return sorted(documents)
     
+    def _scan_folder(self, folder: str) -> Iterator[Tuple[Path, str]]:
+        """
+        Yield supported files below `folder`.
+
+        Parameters:
+        -----------
+        folder : str
+            Directory to scan.
+
+        Yields:
+        -------
+        Tuple[Path, str]
+            Path and lowercase dotted extension of each matching file.
+        """
+        with os.scandir(folder) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if self.recursive:
+                        yield from self._scan_folder(entry.path)
+                elif entry.is_file():
+                    name = entry.name.lower()
+                    if name.endswith(self._suffixes):
+                        yield Path(entry.path), name[name.rfind('.'):]
+
     def read_pdf(self, file_path: Path) -> str:
         """
         Extract text from a PDF file.
 
+        Uses PyMuPDF when it is installed and falls back to PyPDF2 otherwise.
+        With PyMuPDF and `use_processes`, documents longer than
+        `pdf_parallel_page_threshold` pages are split into page ranges
+        extracted on a process pool.
+
         Parameters:
         -----------
         file_path : Path
@@ -117,11 +230,33 @@ class DocumentReader:
 
         Raises:
         -------
+        ImportError
+            If neither PyMuPDF nor PyPDF2 is installed.
         Exception
             If the PDF cannot be read or parsed.
         """
+        if not fitz_available and not pypdf2_available:
+            raise ImportError(
+                "PyMuPDF or PyPDF2 is required to read PDFs. Install with: pip install pymupdf"
+            )
+
         text_content = []
         try:
+            if fitz_available:
+                with _fitz_lock, fitz.open(str(file_path)) as doc:
+                    page_count = doc.page_count
+                    parallel = (
+                        self.use_processes
+                        and page_count > self.pdf_parallel_page_threshold
+                    )
+                    if not parallel:
+                        for page in doc:
+                            text_content.append(page.get_text("text"))
+
+                if parallel:
+                    text_content = self._read_pdf_pages_parallel(file_path, page_count)
+                return '\n'.join(text_content)
+
             with open(file_path, 'rb') as file:
                 pdf_reader = PyPDF2.PdfReader(file)
                 for page in pdf_reader.pages:
@@ -131,10 +266,48 @@ class DocumentReader:
             logger.error(f"Error reading PDF {file_path}: {e}")
             raise
     
+    def _read_pdf_pages_parallel(self, file_path: Path, page_count: int) -> List[str]:
+        """
+        Extract text from a large PDF by splitting its pages across processes.
+
+        PyMuPDF does not support Python threads, so contiguous page ranges are
+        extracted in separate worker processes. Document-level workers
+        (`_read_document_worker`) read without `use_processes`, so pools are
+        never nested.
+
+        Parameters:
+        -----------
+        file_path : Path
+            Path to the PDF file.
+        page_count : int
+            Number of pages in the PDF.
+
+        Returns:
+        --------
+        List[str]
+            Text of each page, in page order.
+        """
+        workers = min(8, os.cpu_count() or 1, page_count)
+        chunk_size = -(-page_count // workers)
+        ranges = [(start, min(start + chunk_size, page_count))
+                  for start in range(0, page_count, chunk_size)]
+
+        starts, stops = zip(*ranges)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            chunks = executor.map(
+                _extract_pdf_pages, [str(file_path)] * len(ranges), starts, stops
+            )
+            return [text for chunk in chunks for text in chunk]
+
     def read_docx(self, file_path: Path) -> str:
         """
         Extract text from a Word document (.docx).
 
+        Streams `word/document.xml` straight out of the archive with
+        `iterparse` instead of building a python-docx object model. As with
+        python-docx's `Document.paragraphs`, only top-level body paragraphs are
+        returned, one per line; run tabs and breaks become `\t` and `\n`.
+
         Parameters:
         -----------
         file_path : Path
@@ -150,9 +323,37 @@ class DocumentReader:
         Exception
             If the docx file cannot be read or parsed.
         """
+        paragraphs = []
+        parts = None
+        stack = []
+
         try:
-            doc = Document(file_path)
-            paragraphs = [para.text for para in doc.paragraphs]
+            with zipfile.ZipFile(file_path) as archive, archive.open('word/document.xml') as xml:
+                for event, element in ElementTree.iterparse(xml, events=('start', 'end')):
+                    tag = element.tag
+                    if event == 'start':
+                        stack.append(tag)
+                        # document > body > p
+                        if len(stack) == 3 and tag == _W_P:
+                            parts = []
+                        continue
+
+                    if parts is not None:
+                        if tag == _W_T:
+                            parts.append(element.text or '')
+                        elif stack[-2] == _W_R:
+                            if tag == _W_TAB:
+                                parts.append('\t')
+                            elif tag in _W_BREAKS:
+                                parts.append('\n')
+
+                    if len(stack) == 3:
+                        if parts is not None:
+                            paragraphs.append(''.join(parts))
+                            parts = None
+                        element.clear()
+                    stack.pop()
+
             return '\n'.join(paragraphs)
         except Exception as e:
             logger.error(f"Error reading DOCX {file_path}: {e}")
@@ -162,6 +363,9 @@ class DocumentReader:
         """
         Read text from a plain text file (.txt).
 
+        Files larger than a memory page are memory-mapped and decoded directly
+        from the mapping; smaller files are read with a plain `read()`.
+
         Parameters:
         -----------
         file_path : Path
@@ -178,13 +382,22 @@ class DocumentReader:
             If the text file cannot be read.
         """
         try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as file:
-                return file.read()
+            with open(file_path, 'rb') as file:
+                if os.fstat(file.fileno()).st_size < mmap.PAGESIZE:
+                    text = file.read().decode('utf-8', errors='ignore')
+                else:
+                    with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        text = str(mm, 'utf-8', 'ignore')
+
+            # Match the newline translation of text-mode reads
+            if '\r' in text:
+                text = text.replace('\r\n', '\n').replace('\r', '\n')
+            return text
         except Exception as e:
             logger.error(f"Error reading TXT {file_path}: {e}")
             raise
     
-    def read_document(self, file_path: Path) -> Dict[str, Any]:
+    def read_document(self, file_path: Path, extension: Optional[str] = None) -> Dict[str, Any]:
         """
         Read a document and return its content with metadata.
 
@@ -192,6 +405,9 @@ class DocumentReader:
         -----------
         file_path : Path
             Path to the document.
+        extension : Optional[str]
+            Lowercase extension including the dot, as returned by
+            `find_documents`. Derived from `file_path` when omitted.
 
         Returns:
         --------
@@ -208,16 +424,13 @@ class DocumentReader:
         ValueError
             If the file type is unsupported.
         """
-        extension = file_path.suffix.lower()
+        if extension is None:
+            extension = file_path.suffix.lower()
         
-        if extension == '.pdf':
-            content = self.read_pdf(file_path)
-        elif extension == '.docx':
-            content = self.read_docx(file_path)
-        elif extension == '.txt':
-            content = self.read_txt(file_path)
-        else:
+        reader = self._readers.get(extension)
+        if reader is None:
             raise ValueError(f"Unsupported file type: {extension}")
+        content = reader(file_path)
         
         return {
             'path': str(file_path),
@@ -227,6 +440,82 @@ class DocumentReader:
             'relative_path': str(file_path.relative_to(self.root_folder))
         }
     
+    def iter_documents(self) -> Iterator[Dict[str, Any]]:
+        """
+        Read supported documents one at a time.
+
+        Yields:
+        -------
+        Dict[str, Any]
+            Document dictionary with metadata and content, in the order of
+            `find_documents`.
+
+        Notes:
+        ------
+        - Skips documents that cannot be read, logging errors.
+        - With parallel reading, at most `2 * max_workers` documents are in
+          flight, so memory use does not grow with the size of the corpus.
+        """
+        found = self.find_documents()
+
+        if self.max_workers == 1 or len(found) <= 1:
+            for file_path, extension in found:
+                try:
+                    doc_data = self.read_document(file_path, extension)
+                except Exception as e:
+                    logger.error(f"Failed to read {file_path}: {e}")
+                    continue
+                logger.info(f"Successfully read: {file_path.name}")
+                yield doc_data
+            return
+
+        if self.use_processes:
+            executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        else:
+            executor = ThreadPoolExecutor(max_workers=self.max_workers)
+
+        window = 2 * self.max_workers
+        pending = deque()
+
+        with executor:
+            for file_path, extension in found:
+                if self.use_processes:
+                    future = executor.submit(
+                        _read_document_worker, str(self.root_folder), file_path, extension
+                    )
+                else:
+                    future = executor.submit(self.read_document, file_path, extension)
+                pending.append((file_path, future))
+                yield from self._drain(pending, window - 1)
+
+            yield from self._drain(pending, 0)
+
+    def _drain(self, pending: deque, keep: int) -> Iterator[Dict[str, Any]]:
+        """
+        Yield results from the front of `pending` until `keep` remain.
+
+        Parameters:
+        -----------
+        pending : deque
+            Queue of `(file_path, future)` pairs in submission order.
+        keep : int
+            Number of futures to leave in the queue.
+
+        Yields:
+        -------
+        Dict[str, Any]
+            Document dictionary for each successfully read file.
+        """
+        while len(pending) > keep:
+            file_path, future = pending.popleft()
+            try:
+                doc_data = future.result()
+            except Exception as e:
+                logger.error(f"Failed to read {file_path}: {e}")
+                continue
+            logger.info(f"Successfully read: {file_path.name}")
+            yield doc_data
+
     def read_all_documents(self) -> List[Dict[str, Any]]:
         """
         Read all supported documents from the folder structure.
@@ -239,18 +528,10 @@ class DocumentReader:
         Notes:
         ------
         - Skips documents that cannot be read, logging errors.
+        - Documents are read in parallel; results keep the order of
+          `find_documents`.
+        - Holds every document in memory; use `iter_documents` to stream
+          large collections.
         - Useful for batch processing of entire directories.
         """
-        documents = []
-        file_paths = self.find_documents()
-        
-        for file_path in file_paths:
-            try:
-                doc_data = self.read_document(file_path)
-                documents.append(doc_data)
-                logger.info(f"Successfully read: {file_path.name}")
-            except Exception as e:
-                logger.error(f"Failed to read {file_path}: {e}")
-                continue
-        
-        return documents
+        return list(self.iter_documents())
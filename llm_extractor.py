@@ -30,27 +30,77 @@ Example:
     >>> print(flow["steps"][0]["step_name"])
 """
 
+import hashlib
 import json
 import logging
-from typing import Dict, List, Optional, Any
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, Any
 import os
 from pathlib import Path
-import re
 
 try:
-    import openai
-    openai_available = True
+    import orjson
+    orjson_available = True
 except ImportError:
-    openai_available = False
+    orjson_available = False
 
 try:
-    import requests
-    requests_available = True
+    import tiktoken
+    tiktoken_available = True
 except ImportError:
-    requests_available = False
+    tiktoken_available = False
 
 logger = logging.getLogger(__name__)
 
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers can
+# catch the stdlib exception regardless of which parser is in use
+_loads = orjson.loads if orjson_available else json.loads
+
+# JSON schema of a single extraction, used for constrained decoding by
+# providers that support it. Metadata such as source_document is filled in
+# by merge_flows, so only the model-generated fields are listed. Strict
+# OpenAI schemas require every property to be listed as required.
+_STEP_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "step_number": {"type": "integer"},
+        "step_name": {"type": "string"},
+        "description": {"type": "string"},
+        "responsible_role": {"type": "string"},
+        "inputs": {"type": "array", "items": {"type": "string"}},
+        "outputs": {"type": "array", "items": {"type": "string"}},
+        "tools": {"type": "array", "items": {"type": "string"}},
+        "decision_points": {"type": "array", "items": {"type": "string"}},
+        "next_steps": {"type": "array", "items": {"type": "integer"}}
+    },
+    "required": [
+        "step_number", "step_name", "description", "responsible_role",
+        "inputs", "outputs", "tools", "decision_points", "next_steps"
+    ],
+    "additionalProperties": False
+}
+
+PROCESS_FLOW_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "process_name": {"type": "string"},
+        "process_description": {"type": "string"},
+        "steps": {"type": "array", "items": _STEP_SCHEMA}
+    },
+    "required": ["process_name", "process_description", "steps"],
+    "additionalProperties": False
+}
+
+# Rough characters-per-token ratio used when no tokenizer is installed
+CHARS_PER_TOKEN = 4
+
+# Generous upper bound on characters per token, used to cap text before
+# tokenizing it so long documents are not encoded in full
+MAX_CHARS_PER_TOKEN = 8
+
+
 def chunk_text(text, chunk_size=3000):
     """
     Split text into chunks of roughly `chunk_size` characters.
@@ -80,20 +130,124 @@ def merge_flows(flows, document_name, model_name="mistral"):
 
     return merged
 
+class _JsonObjectScanner:
+    """
+    Track the brace depth of the first JSON object in a text stream.
+
+    Text can be fed in pieces (e.g. streamed tokens); braces inside string
+    literals are ignored.
+    """
+
+    def __init__(self):
+        self.started = False
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+
+    def feed(self, text: str, start: int = 0) -> int:
+        """
+        Scan `text` from `start` and return the index just past the closing
+        brace of the object, or -1 if it has not been closed yet.
+        """
+        for i in range(start, len(text)):
+            ch = text[i]
+            if not self.started:
+                if ch == "{":
+                    self.started = True
+                    self.depth = 1
+            elif self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif ch == "\\":
+                    self.escaped = True
+                elif ch == '"':
+                    self.in_string = False
+            elif ch == '"':
+                self.in_string = True
+            elif ch == "{":
+                self.depth += 1
+            elif ch == "}":
+                self.depth -= 1
+                if self.depth == 0:
+                    return i + 1
+        return -1
+
+def _find_json_object(text: str) -> Optional[str]:
+    """
+    Locate the first JSON object in `text` with a single bracket-balancing scan.
+
+    Braces inside string literals are ignored. If the object is never closed
+    (e.g. a truncated response), the span up to the last `}` is returned so
+    the caller can attempt a repair.
+    """
+    start = text.find("{")
+    if start < 0:
+        return None
+
+    end = _JsonObjectScanner().feed(text, start)
+    if end < 0:
+        end = text.rfind("}") + 1
+    return text[start:end] if end > start else None
+
+def _sanitize_json(text: str) -> str:
+    """
+    Strip `//` line comments and trailing commas from JSON text in one pass.
+
+    String literals are left untouched, so URLs and commas inside values
+    survive. Unchanged runs of text are copied as slices rather than
+    character by character.
+    """
+    out = []
+    n = len(text)
+    i = 0
+    start = 0
+    in_string = False
+
+    while i < n:
+        ch = text[i]
+        if in_string:
+            if ch == '"':
+                in_string = False
+            elif ch == "\\":
+                i += 1
+        elif ch == '"':
+            in_string = True
+        elif ch == "/" and text.startswith("/", i + 1):
+            # Line comment: drop everything up to the newline
+            out.append(text[start:i])
+            end = text.find("\n", i)
+            i = start = n if end < 0 else end
+            continue
+        elif ch == ",":
+            # Look past whitespace and comments for a closing bracket
+            j = i + 1
+            while j < n:
+                if text[j] in " \t\r\n":
+                    j += 1
+                elif text.startswith("//", j):
+                    end = text.find("\n", j)
+                    j = n if end < 0 else end
+                else:
+                    break
+            if j < n and text[j] in "]}":
+                out.append(text[start:i])
+                start = i + 1
+        i += 1
+
+    out.append(text[start:])
+    return "".join(out)
+
 def safe_json_loads(response_text: str):
-    import re, json
     try:
-        return json.loads(response_text)
+        return _loads(response_text)
     except json.JSONDecodeError:
-        match = re.search(r"\{.*\}", response_text, re.DOTALL)
-        if not match:
+        cleaned = _find_json_object(response_text)
+        if cleaned is None:
             raise ValueError("No JSON object found in response")
 
-        cleaned = match.group(0)
-        cleaned = re.sub(r"//.*", "", cleaned)
-        cleaned = re.sub(r",(\s*[\]}])", r"\1", cleaned)
+        cleaned = _sanitize_json(cleaned)
 
-        # Try parsing again
+        # Try parsing again; the repair path stays on stdlib json
         try:
             return json.loads(cleaned)
         except json.JSONDecodeError:
@@ -127,8 +281,29 @@ class FlowExtractor:
         Prompt template used for extraction.
     api_key : Optional[str]
         API key for the chosen provider.
+    concurrency : int
+        Number of documents extracted in parallel by `extract_from_documents`.
+    cache_dir : Optional[Path]
+        Directory of cached extraction results, or None if caching is off.
+    context_window : int
+        Context size of the model, in tokens. Bounds each request sent.
+    compress_ratio : Optional[float]
+        Fraction of document tokens kept by LLMLingua compression, or None.
     """
 
+    # Tokens held back from the context budget for formatting and markers
+    token_safety_margin = 256
+
+    # Cap on the total document length sent for extraction (~20,000 chars)
+    max_document_tokens = 5000
+
+    # Largest document part sent in one request (~3,000 chars); parts are
+    # smaller still if the context window requires it
+    chunk_tokens = 750
+
+    # Causal LM (7B parameters) that LLMLingua uses to score token importance
+    compression_model = "NousResearch/Llama-2-7b-hf"
+
     default_prompt = """You are an expert at analyzing Standard Operating Procedures (SOPs) and extracting structured process flow information.
 
     [Prompt truncated for brevity in docstring; see class definition for full template]
@@ -143,7 +318,13 @@ class FlowExtractor:
         custom_prompt: Optional[str] = None,
         prompt_file: Optional[str] = None,
         provider: str = "openai",
-        api_base_url: Optional[str] = None
+        api_base_url: Optional[str] = None,
+        concurrency: Optional[int] = None,
+        cache_dir: Optional[str] = None,
+        on_token: Optional[Callable[[str], None]] = None,
+        context_window: int = 8192,
+        compress_ratio: Optional[float] = None,
+        compress_device: Optional[str] = None
     ):
         """
         Initialize the ProcessFlowExtractor.
@@ -166,6 +347,31 @@ class FlowExtractor:
             LLM provider ("openai", "anthropic", or "custom").
         api_base_url : Optional[str]
             Base URL for custom API provider (required if provider="custom").
+        concurrency : Optional[int]
+            Number of documents to extract in parallel. Defaults to
+            `os.cpu_count()` for a local Ollama server and 8 for remote APIs;
+            lower it to stay under a provider's rate limits.
+        cache_dir : Optional[str]
+            Directory for caching extraction results on disk, keyed by the
+            document and every setting that affects the result (provider,
+            model, prompt template, sampling, token budgets, compression).
+            Repeated runs over unchanged documents skip the LLM call.
+            Disabled when None.
+        on_token : Optional[Callable[[str], None]]
+            Callback receiving each token as it is streamed from Ollama. With
+            `concurrency` above 1 it is called from worker threads.
+        context_window : int, default=8192
+            Context size of the model, in tokens. Documents are split into
+            parts small enough that each request (prompt template, document
+            part and response) fits in this window.
+        compress_ratio : Optional[float]
+            If set, compress document content with LLMLingua before sending
+            it, keeping roughly this fraction of tokens (e.g. 0.5). Drops
+            low-information boilerplate such as headers and legal footers.
+            Requires the `llmlingua` package.
+        compress_device : Optional[str]
+            Device for the compression model (e.g. "cpu", "cuda", "mps").
+            Defaults to "cuda" when PyTorch can see a GPU, else "cpu".
 
         Raises:
         -------
@@ -179,16 +385,36 @@ class FlowExtractor:
         self.max_tokens = max_tokens
         self.provider = provider.lower()
         self.api_base_url = api_base_url
+        self.on_token = on_token
+        self.context_window = context_window
+        self._session = None
+        self._requests = None
+        # The tokenizer may need a download, so it is loaded on first use
+        self._encoder = None
+        self._encoder_loaded = False
+        self._encoder_lock = threading.Lock()
+        
+        if concurrency is None:
+            concurrency = (os.cpu_count() or 1) if self.provider == "ollama" else 8
+        self.concurrency = max(1, concurrency)
+        
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        if self.cache_dir is not None:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
         
         # Load prompt from file if provided, otherwise use custom_prompt or default
         if prompt_file:
             self.prompt_template = self._load_prompt_from_file(prompt_file)
         else:
             self.prompt_template = custom_prompt or self.default_prompt
+        self._prompt_template_tokens = None
         
-        # Initialize provider-specific clients
+        # Initialize provider-specific clients. SDKs are imported here so only
+        # the selected provider's dependencies are loaded.
         if self.provider == "openai":
-            if not openai_available:
+            try:
+                import openai
+            except ImportError:
                 raise ImportError(
                     "OpenAI library is required. Install with: pip install openai"
                 )
@@ -201,6 +427,9 @@ class FlowExtractor:
                 )
             
             self.client = openai.OpenAI(api_key=self.api_key)
+            self._openai = openai
+            # Cleared if the model rejects json_schema response formats
+            self._structured_outputs = True
             
         elif self.provider == "anthropic":
             try:
@@ -221,16 +450,25 @@ class FlowExtractor:
             # Ollama runs locally, no API key required
             self.api_key = api_key or "none"
             self.api_base_url = api_base_url or "http://localhost:11434/v1/chat/completions"
-            if not requests_available:
+            try:
+                import requests
+            except ImportError:
                 raise ImportError(
                 "Requests library is required for Ollama. Install with: pip install requests"
             )
+            self._requests = requests
+            self._session = self._create_session()
+            # Cleared if the server predates JSON schema formats (Ollama < 0.5)
+            self._ollama_schema_format = True
 
         elif self.provider == "custom":
-            if not requests_available:
+            try:
+                import requests
+            except ImportError:
                 raise ImportError(
                     "Requests library is required for custom API. Install with: pip install requests"
                 )
+            self._requests = requests
             if not api_base_url:
                 raise ValueError(
                     "api_base_url is required when provider='custom'"
@@ -240,11 +478,84 @@ class FlowExtractor:
                 raise ValueError(
                     "API key is required for custom provider. Provide via api_key parameter."
                 )
+            self._session = self._create_session()
         else:
             raise ValueError(
                 f"Unsupported provider: {provider}. Supported providers: 'openai', 'anthropic', 'custom'"
             )
+        
+        # Loaded last so configuration errors surface before the multi-GB model
+        self.compress_ratio = compress_ratio
+        self._compressor = None
+        self._compress_lock = threading.Lock()
+        if compress_ratio is not None:
+            try:
+                from llmlingua import PromptCompressor
+            except ImportError:
+                raise ImportError(
+                    "LLMLingua is required for prompt compression. Install with: pip install llmlingua"
+                )
+            if compress_device is None:
+                import torch
+                compress_device = "cuda" if torch.cuda.is_available() else "cpu"
+            self._compressor = PromptCompressor(
+                model_name=self.compression_model,
+                device_map=compress_device
+            )
     
+    def _create_session(self) -> "requests.Session":
+        """
+        Create a pooled HTTP session for the Ollama and custom providers.
+
+        Returns:
+        --------
+        requests.Session
+            Session that keeps connections alive between calls and retries
+            rate-limited or failed requests with backoff.
+
+        Notes:
+        ------
+        - Only connection failures and retryable status codes are retried.
+          Read errors are not, since the server may already have run (and
+          billed) the generation.
+        - Once retries are exhausted the last response is returned, so
+          `raise_for_status` raises an HTTPError carrying the response.
+        """
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        retry = Retry(
+            total=3,
+            connect=3,
+            read=0,
+            other=0,
+            status=3,
+            backoff_factor=0.3,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=frozenset({"POST"}),
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=retry)
+
+        session = self._requests.Session()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def close(self):
+        """Close the HTTP session, if one was opened."""
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+    def __enter__(self):
+        """Context manager entry."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit."""
+        self.close()
+
     def _load_prompt_from_file(self, prompt_file: str) -> str:
         """
         Load prompt template from a text file.
@@ -281,22 +592,72 @@ class FlowExtractor:
             raise
 
     def _call_ollama_api(self, prompt: str) -> str:
+        """
+        Call the Ollama generate API and return response text.
+
+        The response is streamed: each token is passed to `on_token` as it
+        arrives, and the stream is closed as soon as a complete JSON object
+        has been generated, so the model does not spend tokens on trailing
+        text.
+
+        PROCESS_FLOW_SCHEMA is passed as the output format so decoding is
+        constrained to the expected structure and the response parses without
+        going through the repair path. Servers older than Ollama 0.5 reject
+        schema formats; for those, the call is repeated with plain JSON mode
+        and JSON mode is used from then on.
+
+        Parameters:
+        -----------
+        prompt : str
+            Prompt to send to the API.
+
+        Returns:
+        --------
+        str
+            Response text (JSON string).
+        """
         headers = {"Content-Type": "application/json"}
         payload = {
             "model": self.model,
             "prompt": prompt,
-            "stream": False,
+            "stream": True,
+            "format": PROCESS_FLOW_SCHEMA if self._ollama_schema_format else "json",
             "options": {
                 "temperature": self.temperature,
                 "num_predict": self.max_tokens
             }
         }
 
-        response = requests.post("http://localhost:11434/api/generate",
-                                headers=headers, json=payload, timeout=120)
-        response.raise_for_status()
-        data = response.json()
-        return data.get("response", "")
+        parts = []
+        scanner = _JsonObjectScanner()
+        loads = _loads
+
+        with self._session.post("http://localhost:11434/api/generate",
+                                headers=headers, json=payload, stream=True, timeout=120) as response:
+            if (response.status_code == 400 and self._ollama_schema_format
+                    and "format" in response.text):
+                logger.warning(
+                    f"Ollama server does not support JSON schema formats, using JSON mode: {response.text[:500]}"
+                )
+                self._ollama_schema_format = False
+                return self._call_ollama_api(prompt)
+            response.raise_for_status()
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                # Lines are raw bytes; orjson parses them without a decode step
+                chunk = loads(line)
+                token = chunk.get("response", "")
+                if token:
+                    parts.append(token)
+                    if self.on_token is not None:
+                        self.on_token(token)
+                    if scanner.feed(token) >= 0:
+                        break
+                if chunk.get("done"):
+                    break
+
+        return "".join(parts)
 
     def extract_process_flow(self, document_content: str, document_name: str = "") -> Dict[str, Any]:
         """
@@ -326,31 +687,35 @@ class FlowExtractor:
         Exception
             For API or extraction errors.
         """
-        # Truncate content if too long (most models have token limits)
+        cache_path = self._cache_path(document_content, document_name)
+        if cache_path is not None and cache_path.exists():
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                logger.info(f"Loaded cached process flow for {document_name}")
+                return json.load(f)
 
-        max_content_length = 20000  # Approximate character limit
-
-        if len(document_content) > max_content_length:
-            logger.warning(
-                f"Document content too long ({len(document_content)} chars), "
-                f"truncating to {max_content_length} chars"
-            )
-            document_content = document_content[:max_content_length]
+        # Cap the total document length
+        document_content = self._truncate_document(document_content)
+        
+        if self._compressor is not None:
+            document_content = self._compress(document_content)
         
-        # break into chunks
-        chunks = chunk_text(document_content, chunk_size=3000)
+        # Break into parts that each fit the context window with the template
+        chunks = self._split_to_budget(document_content)
         flows = []
+        response_text = ""
 
         try:
             for i, chunk in enumerate(chunks, 1):
-                # Build prompt for each chunk
-                prompt = f"{self.prompt_template}\n\n--- Document: {document_name} (part {i}) ---\n\n{chunk}"
+                # Build prompt for each chunk. The template always comes first
+                # so providers with prefix caching can reuse it across calls.
+                document_part = f"--- Document: {document_name} (part {i}) ---\n\n{chunk}"
+                prompt = f"{self.prompt_template}\n\n{document_part}"
 
                 # Call appropriate API
                 if self.provider == "openai":
                     response_text = self._call_openai_api(prompt)
                 elif self.provider == "anthropic":
-                    response_text = self._call_anthropic_api(prompt)
+                    response_text = self._call_anthropic_api(document_part)
                 elif self.provider == "ollama":
                     response_text = self._call_ollama_api(prompt)
                 elif self.provider == "custom":
@@ -365,21 +730,223 @@ class FlowExtractor:
             # Merge all chunk flows into one
             merged_flow = merge_flows(flows, document_name, self.model)
 
+            if cache_path is not None:
+                self._write_cache(cache_path, merged_flow)
+
             logger.info(f"Successfully extracted process flow from {document_name}")
             return merged_flow
             
         except json.JSONDecodeError as e:
             logger.error(f"Failed to parse JSON response: {e}")
-            logger.error(f"Response was: {response_text[:500]}")
+            logger.error(f"Response was: {response_text[:500] if response_text else '<empty>'}")
             raise ValueError(f"Invalid JSON response from LLM: {e}")
         except Exception as e:
             logger.error(f"Error extracting process flow: {e}")
             raise
     
+    @staticmethod
+    def _load_encoder(model: str):
+        """
+        Load a tiktoken encoding for `model`, or None if none can be loaded.
+
+        Models tiktoken does not know (e.g. Ollama or Anthropic models) use
+        `cl100k_base` as an approximation. tiktoken downloads encodings on
+        first use, so offline machines fall back to estimating from length.
+        """
+        if not tiktoken_available:
+            return None
+        try:
+            try:
+                return tiktoken.encoding_for_model(model)
+            except KeyError:
+                return tiktoken.get_encoding("cl100k_base")
+        except Exception as e:
+            logger.warning(f"Could not load tiktoken encoding, estimating token counts: {e}")
+            return None
+
+    def _get_encoder(self):
+        """Return the tokenizer, loading it on first use."""
+        if not self._encoder_loaded:
+            with self._encoder_lock:
+                if not self._encoder_loaded:
+                    self._encoder = self._load_encoder(self.model)
+                    self._encoder_loaded = True
+        return self._encoder
+
+    @staticmethod
+    def _encode(encoder, text: str) -> List[int]:
+        """Tokenize `text`, treating special-token markers such as `<|endoftext|>` as plain text."""
+        return encoder.encode(text, disallowed_special=())
+
+    def _count_tokens(self, text: str) -> int:
+        """Count the tokens in `text`, estimating from its length without a tokenizer."""
+        encoder = self._get_encoder()
+        if encoder is None:
+            return -(-len(text) // CHARS_PER_TOKEN)
+        return len(self._encode(encoder, text))
+
+    def _truncate_document(self, document_content: str) -> str:
+        """
+        Truncate document content to `max_document_tokens`.
+
+        This caps the number of requests made per document; the size of each
+        request is bounded separately by `_split_to_budget`.
+
+        Parameters:
+        -----------
+        document_content : str
+            Text content of the SOP document.
+
+        Returns:
+        --------
+        str
+            The content, cut at the cap if it exceeded it.
+        """
+        limit = self.max_document_tokens
+        encoder = self._get_encoder()
+
+        if encoder is None:
+            max_chars = limit * CHARS_PER_TOKEN
+            if len(document_content) <= max_chars:
+                return document_content
+            logger.warning(
+                f"Document content too long ({len(document_content)} chars), "
+                f"truncating to {max_chars} chars (~{limit} tokens)"
+            )
+            return document_content[:max_chars]
+
+        tokens = self._encode(encoder, document_content[:limit * MAX_CHARS_PER_TOKEN])
+        if len(tokens) <= limit and len(document_content) <= limit * MAX_CHARS_PER_TOKEN:
+            return document_content
+        logger.warning(
+            f"Document content too long ({len(document_content)} chars), "
+            f"truncating to {limit} tokens"
+        )
+        return encoder.decode(tokens[:limit])
+
+    def _split_to_budget(self, document_content: str) -> List[str]:
+        """
+        Split document content into parts that each fit one request.
+
+        A part holds at most `chunk_tokens` tokens, and no more than the
+        context window leaves after the prompt template, the response
+        (`max_tokens`) and `token_safety_margin`.
+
+        Parameters:
+        -----------
+        document_content : str
+            Text content of the SOP document.
+
+        Returns:
+        --------
+        List[str]
+            Document parts, in order.
+        """
+        if self._prompt_template_tokens is None:
+            self._prompt_template_tokens = self._count_tokens(self.prompt_template)
+
+        budget = (
+            self.context_window - self._prompt_template_tokens
+            - self.max_tokens - self.token_safety_margin
+        )
+        if budget <= 0:
+            raise ValueError(
+                f"context_window ({self.context_window}) leaves no room for document "
+                f"content after the prompt template and max_tokens ({self.max_tokens})"
+            )
+        part_tokens = min(self.chunk_tokens, budget)
+
+        encoder = self._get_encoder()
+        if encoder is None:
+            return chunk_text(document_content, chunk_size=part_tokens * CHARS_PER_TOKEN)
+
+        tokens = self._encode(encoder, document_content)
+        return [
+            encoder.decode(tokens[i:i + part_tokens])
+            for i in range(0, len(tokens), part_tokens)
+        ]
+
+    def _compress(self, document_content: str) -> str:
+        """
+        Prune low-information tokens from document content with LLMLingua.
+
+        Line breaks and full stops are always kept so the step structure of
+        the SOP survives compression.
+
+        Parameters:
+        -----------
+        document_content : str
+            Text content of the SOP document.
+
+        Returns:
+        --------
+        str
+            Compressed content.
+        """
+        # The underlying model is not safe to call from several threads at once
+        with self._compress_lock:
+            result = self._compressor.compress_prompt(
+                document_content,
+                rate=self.compress_ratio,
+                force_tokens=['\n', '.']
+            )
+        return result["compressed_prompt"]
+
+    def _cache_path(self, document_content: str, document_name: str) -> Optional[Path]:
+        """
+        Return the cache file for a document, or None if caching is disabled.
+
+        Parameters:
+        -----------
+        document_content : str
+            Text content of the SOP document.
+        document_name : str
+            Name of the document (part of the cached metadata).
+
+        Returns:
+        --------
+        Optional[Path]
+            Path of the JSON cache entry.
+        """
+        if self.cache_dir is None:
+            return None
+
+        # Every setting that changes what is sent or generated is part of the key
+        settings = (
+            self.provider, self.model, self.temperature, self.max_tokens,
+            self.context_window, self.chunk_tokens, self.max_document_tokens,
+            self.compress_ratio, self.prompt_template, document_name
+        )
+        key = hashlib.blake2b(
+            f"{settings!r}|{document_content}".encode('utf-8'),
+            digest_size=16
+        ).hexdigest()
+        return self.cache_dir / f"{key}.json"
+
+    def _write_cache(self, cache_path: Path, process_flow: Dict[str, Any]):
+        """
+        Write an extraction result to the cache.
+
+        The file is written under a temporary name and renamed into place, so
+        concurrent extractions never see a partial entry.
+        """
+        tmp_path = cache_path.with_suffix(f".{threading.get_ident()}.tmp")
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(process_flow, f)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            logger.warning(f"Could not write cache entry {cache_path}: {e}")
+
     def _call_openai_api(self, prompt: str) -> str:
         """
         Call OpenAI API and return response text.
 
+        Structured outputs constrain the response to PROCESS_FLOW_SCHEMA.
+        Models without structured-output support (e.g. gpt-3.5-turbo) reject
+        the schema; for those, the call is repeated in JSON mode and JSON mode
+        is used from then on.
+
         Parameters:
         -----------
         prompt : str
@@ -390,12 +957,39 @@ class FlowExtractor:
         str
             Response text (JSON string).
         """
+        messages = [
+            {"role": "system", "content": "You are an expert at extracting structured process flows from SOP documents."},
+            {"role": "user", "content": prompt}
+        ]
+
+        if self._structured_outputs:
+            try:
+                response = self.client.chat.completions.create(
+                    model=self.model,
+                    messages=messages,
+                    temperature=self.temperature,
+                    max_tokens=self.max_tokens,
+                    response_format={
+                        "type": "json_schema",
+                        "json_schema": {
+                            "name": "process_flow",
+                            "schema": PROCESS_FLOW_SCHEMA,
+                            "strict": True
+                        }
+                    }
+                )
+                return response.choices[0].message.content
+            except self._openai.BadRequestError as e:
+                if "response_format" not in str(e) and "json_schema" not in str(e):
+                    raise
+                logger.warning(
+                    f"Model {self.model} does not support structured outputs, using JSON mode: {e}"
+                )
+                self._structured_outputs = False
+
         response = self.client.chat.completions.create(
             model=self.model,
-            messages=[
-                {"role": "system", "content": "You are an expert at extracting structured process flows from SOP documents."},
-                {"role": "user", "content": prompt}
-            ],
+            messages=messages,
             temperature=self.temperature,
             max_tokens=self.max_tokens,
             response_format={"type": "json_object"}
@@ -403,14 +997,18 @@ class FlowExtractor:
 
         return response.choices[0].message.content
     
-    def _call_anthropic_api(self, prompt: str) -> str:
+    def _call_anthropic_api(self, document_part: str) -> str:
         """
         Call Anthropic API and return response text.
 
+        The prompt template is sent as its own content block marked with
+        `cache_control`, so Anthropic caches it and only the document part is
+        processed in full on each call.
+
         Parameters:
         -----------
-        prompt : str
-            Prompt to send to the API.
+        document_part : str
+            Document header and content, sent after the prompt template.
 
         Returns:
         --------
@@ -425,21 +1023,25 @@ class FlowExtractor:
             temperature=self.temperature,
             system=system_message,
             messages=[
-                {"role": "user", "content": prompt}
+                {
+                    "role": "user",
+                    "content": [
+                        {
+                            "type": "text",
+                            "text": self.prompt_template,
+                            "cache_control": {"type": "ephemeral"}
+                        },
+                        {"type": "text", "text": document_part}
+                    ]
+                }
             ]
         )
         
         # Anthropic returns content as a list of text blocks
-
-        response_text = ""
-
-        for block in response.content:
-            if hasattr(block, 'text'):
-                response_text += block.text
-            elif isinstance(block, str):
-                response_text += block
-        
-        return response_text
+        return "".join(
+            getattr(block, 'text', block if isinstance(block, str) else "")
+            for block in response.content
+        )
     
     def _call_custom_api(self, prompt: str) -> str:
         """
@@ -480,15 +1082,25 @@ class FlowExtractor:
         payload["response_format"] = {"type": "json_object"}
         
         try:
-            response = requests.post(
+            # Streamed so an error body can be logged without reading all of it;
+            # successful bodies are read in full, which releases the connection
+            response = self._session.post(
                 self.api_base_url,
                 headers=headers,
                 json=payload,
+                stream=True,
                 timeout=60
             )
             response.raise_for_status()
             
-            response_data = response.json()
+            # Parse the body bytes directly instead of decoding to str first
+            try:
+                response_data = _loads(response.content)
+            except json.JSONDecodeError:
+                logger.error(f"Custom API returned a non-JSON body (status {response.status_code})")
+                head = response.content[:500].decode(response.encoding or "utf-8", errors="replace")
+                logger.error(f"Response body: {head if head else '<empty>'}")
+                raise
             
             # Try to extract response text from common response formats
 
@@ -513,21 +1125,31 @@ class FlowExtractor:
                 logger.warning(f"Unexpected API response format: {list(response_data.keys())}")
                 return json.dumps(response_data)
                 
-        except requests.exceptions.RequestException as e:
+        except self._requests.exceptions.RequestException as e:
             logger.error(f"Error calling custom API: {e}")
             if hasattr(e, 'response') and e.response is not None:
                 logger.error(f"Response status: {e.response.status_code}")
-                logger.error(f"Response body: {e.response.text[:500]}")
+                # The body is still unread (stream=True), so read only its head
+                # and close the response to return its connection to the pool
+                try:
+                    head = next(e.response.iter_content(512), b"")
+                    if isinstance(head, bytes):
+                        head = head.decode(e.response.encoding or "utf-8", errors="replace")
+                    logger.error(f"Response body: {head[:500]}")
+                finally:
+                    e.response.close()
             raise
     
-    def extract_from_documents(self, documents: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def extract_from_documents(self, documents: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
         Extract process flows from multiple documents.
 
         Parameters:
         -----------
-        documents : List[Dict[str, Any]]
-            List of document dictionaries (from DocumentReader).
+        documents : Iterable[Dict[str, Any]]
+            Document dictionaries from DocumentReader. Passing
+            `DocumentReader.iter_documents()` streams documents so each one's
+            content can be released once it has been processed.
 
         Returns:
         --------
@@ -537,22 +1159,52 @@ class FlowExtractor:
         Notes:
         ------
         - Skips documents that fail extraction, logging errors.
+        - Documents are extracted on a pool of `concurrency` threads, with at
+          most `2 * concurrency` in flight; results keep the input order.
         - Useful for batch processing of SOP repositories.
         """
         extracted_flows = []
+        pending = deque()
+        window = 2 * self.concurrency
         
-        for doc in documents:
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            for doc in documents:
+                try:
+                    # Keep only the metadata so the content can be released
+                    metadata = (doc['name'], doc['path'], doc.get('relative_path', ''))
+                    future = executor.submit(self.extract_process_flow, doc['content'], doc['name'])
+                except Exception as e:
+                    logger.error(f"Failed to extract process flow from {doc.get('name', '<unnamed document>')}: {e}")
+                    continue
+                pending.append((metadata, future))
+                self._collect_flows(pending, window - 1, extracted_flows)
+            
+            self._collect_flows(pending, 0, extracted_flows)
+        
+        return extracted_flows
+    
+    def _collect_flows(self, pending: deque, keep: int, extracted_flows: List[Dict[str, Any]]):
+        """
+        Move finished extractions from the front of `pending` into `extracted_flows`.
+
+        Parameters:
+        -----------
+        pending : deque
+            Queue of `((name, path, relative_path), future)` pairs in
+            submission order.
+        keep : int
+            Number of futures to leave in the queue.
+        extracted_flows : List[Dict[str, Any]]
+            List that receives each extracted process flow.
+        """
+        while len(pending) > keep:
+            (name, path, relative_path), future = pending.popleft()
             try:
-                process_flow = self.extract_process_flow(
-                    doc['content'],
-                    doc['name']
-                )
-                # Add document metadata
-                process_flow['document_path'] = doc['path']
-                process_flow['document_relative_path'] = doc.get('relative_path', '')
-                extracted_flows.append(process_flow)
+                process_flow = future.result()
             except Exception as e:
-                logger.error(f"Failed to extract process flow from {doc['name']}: {e}")
+                logger.error(f"Failed to extract process flow from {name}: {e}")
                 continue
-        
-        return extracted_flows
+            # Add document metadata
+            process_flow['document_path'] = path
+            process_flow['document_relative_path'] = relative_path
+            extracted_flows.append(process_flow)
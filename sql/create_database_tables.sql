@@ -15,7 +15,16 @@ CREATE TABLE IF NOT EXISTS process (
 	document_path TEXT NOT NULL,
 	extraction_model TEXT,
 	extraction_timestamp datetime DEFAULT CURRENT_TIMESTAMP,
-	created_at datetime DEFAULT CURRENT_TIMESTAMP
+	created_at datetime DEFAULT CURRENT_TIMESTAMP,
+	raw_data BLOB
+	);
+
+CREATE INDEX IF NOT EXISTS idx_process_created ON process (
+	created_at DESC,
+	process_name,
+	process_description,
+	source_document,
+	extraction_timestamp
 	);
 	
 CREATE TABLE stream_process (
@@ -37,9 +46,18 @@ CREATE TABLE IF NOT EXISTS step (
 	outputs TEXT,
 	tools TEXT,
 	decision_points TEXT,
-	next_steps TEXT,
 	FOREIGN KEY (process_id) REFERENCES process(process_id) ON DELETE CASCADE
 	);
+
+CREATE INDEX IF NOT EXISTS idx_step_process ON step (process_id, step_number);
+	
+CREATE TABLE IF NOT EXISTS step_next_step (
+	step_id INTEGER NOT NULL,
+	ordinal INTEGER NOT NULL,
+	next_step_number INTEGER NOT NULL,
+	PRIMARY KEY (step_id, ordinal),
+	FOREIGN KEY (step_id) REFERENCES step(step_id) ON DELETE CASCADE
+	) WITHOUT ROWID;
 	
 CREATE TABLE IF NOT EXISTS role (
 	role_id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -0,0 +1,16 @@
+from llm_extractor import safe_json_loads
+
+
+def test_trailing_comma_before_comment():
+    assert safe_json_loads('Here: {"a": 1, // last item\n}') == {"a": 1}
+    assert safe_json_loads('{"a": [1, 2, // two\n]}') == {"a": [1, 2]}
+
+
+def test_comment_markers_inside_strings_are_kept():
+    assert safe_json_loads('{"url": "http://x,}", // c\n "b": 1,}') == {"url": "http://x,}", "b": 1}
+
+
+if __name__ == "__main__":
+    test_trailing_comma_before_comment()
+    test_comment_markers_inside_strings_are_kept()
+    print("✅ safe_json_loads tests passed")